@@ -1,7 +1,149 @@
 import sqlite3
+import functools
 import json
+import msgpack
+import threading
 from xai_components.base import InArg, InCompArg, OutArg, Component, xai_component
 
+
+# msgpack.packb builds a new Packer on every call; keep one per thread instead
+_packers = threading.local()
+
+
+def _pack(value):
+    packer = getattr(_packers, 'packer', None)
+    if packer is None:
+        packer = _packers.packer = msgpack.Packer(use_bin_type=True)
+    return packer.pack(value)
+
+
+def _unpack(data):
+    # Rows created before the MessagePack switch still hold JSON text
+    if isinstance(data, str):
+        return json.loads(data)
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def _repack(data):
+    if not isinstance(data, str):
+        return data
+    try:
+        return _pack(json.loads(data))
+    except OverflowError:
+        # MessagePack only holds 64-bit integers; keep such rows as JSON text
+        return data
+
+
+# task_id is the primary key of a WITHOUT ROWID table, so lookups by task_id
+# read the row straight from the primary key B-tree
+TASK_COLUMNS = 'task_id, summary, conversation, details, steps, current_step_num, is_active, is_waiting'
+SQL_CREATE_TASKS = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        task_id TEXT PRIMARY KEY NOT NULL,
+        summary TEXT NOT NULL,
+        conversation BLOB,
+        details TEXT,
+        steps BLOB,
+        current_step_num INTEGER DEFAULT 0,
+        is_active BOOLEAN DEFAULT 1,
+        is_waiting BOOLEAN DEFAULT 0
+    ) WITHOUT ROWID
+'''
+# Inactive tasks are moved to tasks_archive, so the tasks table only holds the
+# active working set no matter how many tasks have been completed over time.
+# The triggers keep task_id unique across both tables. A row being moved has its
+# is_active flag flipped first, so only rows that really belong to the other table
+# block the insert.
+SQL_CREATE_TASKS_TRIGGER = '''
+    CREATE TRIGGER IF NOT EXISTS tasks_unique_task_id BEFORE INSERT ON tasks
+    WHEN EXISTS (SELECT 1 FROM tasks_archive WHERE task_id = NEW.task_id AND NOT is_active)
+    BEGIN
+        SELECT RAISE(ABORT, 'UNIQUE constraint failed: tasks.task_id');
+    END
+'''
+SQL_CREATE_ARCHIVE_TRIGGER = '''
+    CREATE TRIGGER IF NOT EXISTS tasks_archive_unique_task_id BEFORE INSERT ON tasks_archive
+    WHEN EXISTS (SELECT 1 FROM tasks WHERE task_id = NEW.task_id AND is_active)
+    BEGIN
+        SELECT RAISE(ABORT, 'UNIQUE constraint failed: tasks_archive.task_id');
+    END
+'''
+# Run by TasksOpenDB after its own BEGIN, so any upgrades share the transaction
+SQL_SETUP_SCHEMA = f'''
+    {SQL_CREATE_TASKS.format(table='tasks')};
+    {SQL_CREATE_TASKS.format(table='tasks_archive')};
+    {SQL_CREATE_TASKS_TRIGGER};
+    {SQL_CREATE_ARCHIVE_TRIGGER};
+'''
+# Tables and triggers created by SQL_SETUP_SCHEMA, used to tell whether it has to run
+SQL_LIST_SCHEMA_OBJECTS = "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')"
+SCHEMA_OBJECTS = frozenset(('tasks', 'tasks_archive', 'tasks_unique_task_id', 'tasks_archive_unique_task_id'))
+
+# Statements are kept as module-level constants so every call passes the exact
+# same SQL text and hits sqlite3's per-connection prepared statement cache.
+SQL_INSERT = 'INSERT INTO tasks (task_id, summary, conversation, details, steps) VALUES (?, ?, ?, ?, ?)'
+SQL_GET = f'SELECT {TASK_COLUMNS} FROM tasks WHERE task_id = ? UNION ALL SELECT {TASK_COLUMNS} FROM tasks_archive WHERE task_id = ?'
+SQL_DELETE = 'DELETE FROM tasks WHERE task_id = ?'
+SQL_DELETE_ARCHIVED = 'DELETE FROM tasks_archive WHERE task_id = ?'
+SQL_LIST_ACTIVE = 'SELECT task_id, summary, conversation, details, steps, current_step_num, is_active, is_waiting FROM tasks'
+SQL_LIST_ACTIVE_SUMMARY = 'SELECT task_id, summary, current_step_num, is_active, is_waiting FROM tasks'
+SQL_ARCHIVE = f'INSERT INTO tasks_archive ({TASK_COLUMNS}) SELECT {TASK_COLUMNS} FROM tasks WHERE task_id = ?'
+SQL_UNARCHIVE = f'INSERT INTO tasks ({TASK_COLUMNS}) SELECT {TASK_COLUMNS} FROM tasks_archive WHERE task_id = ?'
+SQL_SET_FLAGS = 'UPDATE tasks SET is_active = COALESCE(?, is_active), is_waiting = COALESCE(?, is_waiting) WHERE task_id = ?'
+SQL_SET_ARCHIVED_FLAGS = 'UPDATE tasks_archive SET is_active = COALESCE(?, is_active), is_waiting = COALESCE(?, is_waiting) WHERE task_id = ?'
+SQL_LIST_LEGACY_JSON = "SELECT task_id, conversation, steps FROM tasks WHERE typeof(conversation) = 'text' OR typeof(steps) = 'text'"
+SQL_REPACK = 'UPDATE tasks SET conversation = ?, steps = ? WHERE task_id = ?'
+
+# Only the columns actually given to TasksUpdateTask are written, and the row is
+# left untouched when every given value already matches what is stored. At most
+# 15 column combinations exist per table, so each keeps a stable statement text.
+@functools.lru_cache(maxsize=32)
+def _update_sql(table, columns):
+    assignments = ', '.join(f'{column} = ?' for column in columns)
+    changed = ' OR '.join(f'{column} IS NOT ?' for column in columns)
+    return f'UPDATE {table} SET {assignments} WHERE task_id = ? AND ({changed})'
+
+# sqlite3 keeps an LRU of prepared statements per connection and re-prepares them
+# itself after schema changes; size it so ad-hoc queries on the shared connection
+# don't evict the statements above.
+STATEMENT_CACHE_SIZE = 256
+SCHEMA_VERSION = 3
+
+
+# Hand is_active/is_waiting (declared BOOLEAN) back as bool instead of 0/1; any
+# non-zero value stored outside these components still reads as True
+sqlite3.register_converter('BOOLEAN', lambda value: value not in (b'0', b''))
+
+
+def _set_flags(conn, task_id, is_active=None, is_waiting=None):
+    # Flags left as None keep their stored value. Changing is_active moves the row
+    # between tasks and tasks_archive, so both happen in one transaction.
+    if is_active is not None:
+        is_active = bool(is_active)
+    if is_waiting is not None:
+        is_waiting = bool(is_waiting)
+    with conn:
+        if is_active is None:
+            conn.execute(SQL_SET_FLAGS, (None, is_waiting, task_id))
+            conn.execute(SQL_SET_ARCHIVED_FLAGS, (None, is_waiting, task_id))
+        elif is_active:
+            # Flags are set before the move so the uniqueness triggers let it through
+            conn.execute(SQL_SET_ARCHIVED_FLAGS, (True, is_waiting, task_id))
+            conn.execute(SQL_UNARCHIVE, (task_id,))
+            conn.execute(SQL_DELETE_ARCHIVED, (task_id,))
+            conn.execute(SQL_SET_FLAGS, (True, is_waiting, task_id))
+        else:
+            conn.execute(SQL_SET_FLAGS, (False, is_waiting, task_id))
+            conn.execute(SQL_ARCHIVE, (task_id,))
+            conn.execute(SQL_DELETE, (task_id,))
+            conn.execute(SQL_SET_ARCHIVED_FLAGS, (False, is_waiting, task_id))
+
+class _TasksConnMixin:
+    def _conn(self, ctx):
+        # Use the connection port if wired, otherwise the one opened by TasksOpenDB
+        conn = self.connection.value
+        return conn if conn is not None else ctx['tasksdb_conn']
+
 @xai_component
 class TasksOpenDB(Component):
     """Opens or creates a SQLite database with the proper schema for task management.
@@ -17,40 +159,71 @@ class TasksOpenDB(Component):
     connection: OutArg[sqlite3.Connection]  # Output connection to the database
 
     def execute(self, ctx) -> None:
-        conn = sqlite3.connect(self.db_file.value)
-        cursor = conn.cursor()
-        
-        # Create the tasks table if it doesn't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id TEXT UNIQUE NOT NULL,
-                summary TEXT NOT NULL,
-                conversation TEXT,
-                details TEXT,
-                steps TEXT,
-                current_step_num INTEGER DEFAULT 0,
-                is_active BOOLEAN DEFAULT 1,
-                is_waiting BOOLEAN DEFAULT 0
-            )
-        ''')
-        conn.commit()
+        conn = sqlite3.connect(self.db_file.value, detect_types=sqlite3.PARSE_DECLTYPES, cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+
+        # WAL lets readers run alongside a writer; NORMAL sync is safe under WAL
+        if self.db_file.value != ':memory:':
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            conn.execute('PRAGMA cache_size=-65536')
+            conn.execute('PRAGMA busy_timeout=5000')
+
+        # Only take the write lock when the schema is missing or needs an upgrade, so
+        # opening an up-to-date database doesn't wait on other writers
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        names = {row[0] for row in conn.execute(SQL_LIST_SCHEMA_OBJECTS)}
+        needs_setup = version < SCHEMA_VERSION or not SCHEMA_OBJECTS <= names
+
+        # Schema creation and upgrades share one transaction, committed once below
+        try:
+            conn.executescript(('BEGIN IMMEDIATE;' if needs_setup else 'BEGIN;') + SQL_SETUP_SCHEMA)
+
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version < 1:
+                # Re-pack rows from databases created when conversation/steps were stored as JSON text
+                legacy_rows = conn.execute(SQL_LIST_LEGACY_JSON).fetchall()
+                conn.executemany(SQL_REPACK, [(_repack(row[1]), _repack(row[2]), row[0]) for row in legacy_rows])
+            if version < 2 and 'id' in [column[1] for column in conn.execute('PRAGMA table_info(tasks)')]:
+                # Rebuild tables from before task_id became the primary key
+                conn.execute('DROP TABLE IF EXISTS tasks_rebuild')
+                conn.execute(SQL_CREATE_TASKS.format(table='tasks_rebuild'))
+                conn.execute(f'INSERT INTO tasks_rebuild ({TASK_COLUMNS}) SELECT {TASK_COLUMNS} FROM tasks')
+                # The archive trigger refers to tasks, which would make the rename fail
+                conn.execute('DROP TRIGGER IF EXISTS tasks_archive_unique_task_id')
+                conn.execute('DROP TABLE tasks')
+                conn.execute('ALTER TABLE tasks_rebuild RENAME TO tasks')
+                conn.execute(SQL_CREATE_TASKS_TRIGGER)
+                conn.execute(SQL_CREATE_ARCHIVE_TRIGGER)
+            if version < 3:
+                # Move tasks completed before the archive table existed out of the active table
+                conn.execute(f'INSERT INTO tasks_archive ({TASK_COLUMNS}) SELECT {TASK_COLUMNS} FROM tasks WHERE is_active = 0')
+                conn.execute('DELETE FROM tasks WHERE is_active = 0')
+                conn.execute('DROP INDEX IF EXISTS idx_tasks_active')
+            if version < SCHEMA_VERSION:
+                conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            conn.close()
+            raise
         self.connection.value = conn
         ctx['tasksdb_conn'] = conn
 
 @xai_component
-class TasksCreateTask(Component):
+class TasksCreateTask(_TasksConnMixin, Component):
     """Creates a new task in the database with the specified details.
     
     ##### inPorts:
     - connection: SQLite database connection
+    - task_id: Unique ID for the new task
     - summary: Brief description of the task
     - conversation: List of conversation history related to the task
     - details: Detailed description of the task
     - steps: List of steps to complete the task
-    
-    ##### outPorts:
-    - task_id: ID of the newly created task
+    - autocommit: Whether to commit right after the insert (default True).
+      Set to False when creating tasks in a loop and finish with TasksCommit.
     """
     
     connection: InArg[sqlite3.Connection]
@@ -59,19 +232,63 @@ class TasksCreateTask(Component):
     conversation: InCompArg[list]
     details: InCompArg[str]
     steps: InCompArg[list]
+    autocommit: InArg[bool]
+
+    def execute(self, ctx) -> None:
+        conn = self._conn(ctx)
+        conn.execute(SQL_INSERT, (self.task_id.value, self.summary.value, _pack(self.conversation.value), self.details.value, _pack(self.steps.value)))
+        if self.autocommit.value is not False:
+            conn.commit()
+
+@xai_component
+class TasksCreateTasksBatch(_TasksConnMixin, Component):
+    """Creates several tasks at once in a single transaction.
+    
+    ##### inPorts:
+    - connection: SQLite database connection
+    - task_ids: List of IDs for the new tasks
+    - summaries: List of brief task descriptions
+    - conversations: List of conversation histories, one per task
+    - details_list: List of detailed task descriptions
+    - steps_list: List of step lists, one per task
+    """
+    
+    connection: InArg[sqlite3.Connection]
+    task_ids: InCompArg[list]
+    summaries: InCompArg[list]
+    conversations: InCompArg[list]
+    details_list: InCompArg[list]
+    steps_list: InCompArg[list]
 
     def execute(self, ctx) -> None:
-        conn = self.connection.value if self.connection.value is not None else ctx['tasksdb_conn']
+        conn = self._conn(ctx)
+        columns = (self.task_ids.value, self.summaries.value, self.conversations.value, self.details_list.value, self.steps_list.value)
+        if len(set(map(len, columns))) != 1:
+            raise ValueError('task_ids, summaries, conversations, details_list and steps_list must have the same length')
+
+        rows = [
+            (task_id, summary, _pack(conversation), details, _pack(steps))
+            for task_id, summary, conversation, details, steps in zip(*columns)
+        ]
+        with conn:
+            conn.executemany(SQL_INSERT, rows)
 
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO tasks (task_id, summary, conversation, details, steps)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (self.task_id.value, self.summary.value, json.dumps(self.conversation.value), self.details.value, json.dumps(self.steps.value)))
+@xai_component
+class TasksCommit(_TasksConnMixin, Component):
+    """Commits pending changes, e.g. tasks created with autocommit disabled.
+    
+    ##### inPorts:
+    - connection: SQLite database connection
+    """
+    
+    connection: InArg[sqlite3.Connection]
+
+    def execute(self, ctx) -> None:
+        conn = self._conn(ctx)
         conn.commit()
 
 @xai_component
-class TasksGetTaskDetails(Component):
+class TasksGetTaskDetails(_TasksConnMixin, Component):
     """Retrieves all details of a specific task by its ID.
     
     ##### inPorts:
@@ -101,26 +318,25 @@ class TasksGetTaskDetails(Component):
     is_waiting: OutArg[bool]
 
     def execute(self, ctx) -> None:
-        conn = self.connection.value if self.connection.value is not None else ctx['tasksdb_conn']
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT task_id, summary, conversation, details, steps, current_step_num, is_active, is_waiting FROM tasks WHERE task_id = ?', (self.task_id.value,))
-        row = cursor.fetchone()
+        conn = self._conn(ctx)
+        row = conn.execute(SQL_GET, (self.task_id.value, self.task_id.value)).fetchone()
         if row:
+            conversation = _unpack(row[2])
+            steps = _unpack(row[4])
             self.task_details.value = {
                 'task_id': row[0],
                 'summary': row[1],
-                'conversation': json.loads(row[2]),
+                'conversation': conversation,
                 'details': row[3],
-                'steps': json.loads(row[4]),
+                'steps': steps,
                 'current_step_num': row[5],
                 'is_active': row[6],
                 'is_waiting': row[7]
             }
             self.summary.value = row[1]
-            self.conversation.value = json.loads(row[2])
+            self.conversation.value = conversation
             self.details.value = row[3]
-            self.steps.value = json.loads(row[4])
+            self.steps.value = steps
             self.current_step_num.value = row[5]
             self.is_active.value = row[6]
             self.is_waiting.value = row[7]
@@ -135,7 +351,7 @@ class TasksGetTaskDetails(Component):
             self.is_waiting.value = None
 
 @xai_component
-class TasksDeleteTask(Component):
+class TasksDeleteTask(_TasksConnMixin, Component):
     """Deletes a task from the database.
     
     ##### inPorts:
@@ -147,13 +363,13 @@ class TasksDeleteTask(Component):
     task_id: InCompArg[str]
 
     def execute(self, ctx) -> None:
-        conn = self.connection.value if self.connection.value is not None else ctx['tasksdb_conn']
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM tasks WHERE task_id = ?', (self.task_id.value,))
+        conn = self._conn(ctx)
+        conn.execute(SQL_DELETE, (self.task_id.value,))
+        conn.execute(SQL_DELETE_ARCHIVED, (self.task_id.value,))
         conn.commit()
 
 @xai_component
-class TasksUpdateTask(Component):
+class TasksUpdateTask(_TasksConnMixin, Component):
     """Updates an existing task's details.
     
     ##### inPorts:
@@ -173,57 +389,95 @@ class TasksUpdateTask(Component):
     steps: InArg[list]
 
     def execute(self, ctx) -> None:
-        conn = self.connection.value if self.connection.value is not None else ctx['tasksdb_conn']
-        cursor = conn.cursor()
+        conn = self._conn(ctx)
+        updates = {}
+        if self.summary.value is not None:
+            updates['summary'] = self.summary.value
+        if self.conversation.value is not None:
+            updates['conversation'] = _pack(self.conversation.value)
+        if self.details.value is not None:
+            updates['details'] = self.details.value
+        if self.steps.value is not None:
+            updates['steps'] = _pack(self.steps.value)
+        if not updates:
+            return
 
-        cursor.execute('SELECT task_id, summary, conversation, details, steps FROM tasks WHERE task_id = ?', (self.task_id.value,))
-        row = cursor.fetchone()
-        if row:
-            summary = self.summary.value if self.summary.value is not None else row[1]
-            conversation = self.conversation.value if self.conversation.value is not None else json.loads(row[2])
-            details = self.details.value if self.details.value is not None else row[3]
-            steps = self.steps.value if self.steps.value is not None else json.loads(row[4])
-            
-            cursor.execute('''
-                UPDATE tasks
-                SET summary = ?, conversation = ?, details = ?, steps = ?
-                WHERE task_id = ?
-            ''', (summary, json.dumps(conversation), details, json.dumps(steps), self.task_id.value))
+        columns = tuple(updates)
+        params = tuple(updates.values()) + (self.task_id.value,) + tuple(updates.values())
+        if conn.execute(_update_sql('tasks', columns), params).rowcount == 0:
+            # Either nothing changed or the task has been archived
+            conn.execute(_update_sql('tasks_archive', columns), params)
         conn.commit()
 
 @xai_component
-class TasksListActiveTasks(Component):
+class TasksListActiveTasks(_TasksConnMixin, Component):
     """Retrieves a list of all active tasks from the database.
     
     ##### inPorts:
     - connection: SQLite database connection
+    - include_payload: Whether to include conversation, details and steps (default True).
+      Set to False to only fetch the task summaries, which skips decoding conversation and steps.
     
     ##### outPorts:
     - active_tasks: List of dictionaries containing active task details
     """
     
     connection: InArg[sqlite3.Connection]
+    include_payload: InArg[bool]
     active_tasks: OutArg[list]  # Output list of active tasks
 
     def execute(self, ctx) -> None:
-        conn = self.connection.value if self.connection.value is not None else ctx['tasksdb_conn']
-        cursor = conn.cursor()
-        cursor.execute('SELECT task_id, summary, conversation, details, steps, current_step_num, is_active, is_waiting FROM tasks WHERE is_active = 1')
-        rows = cursor.fetchall()
-        self.active_tasks.value = [{
-            'task_id': row[0],
-            'summary': row[1],
-            'conversation': json.loads(row[2]),
-            'details': row[3],
-            'steps': json.loads(row[4]),
-            'current_step_num': row[5],
-            'is_active': row[6],
-            'is_waiting': row[7]
-        } for row in rows]
+        conn = self._conn(ctx)
+        include_payload = self.include_payload.value if self.include_payload.value is not None else True
+
+        if not include_payload:
+            self.active_tasks.value = [{
+                'task_id': row[0],
+                'summary': row[1],
+                'current_step_num': row[2],
+                'is_active': row[3],
+                'is_waiting': row[4]
+            } for row in conn.execute(SQL_LIST_ACTIVE_SUMMARY)]
+            return
+
+        # Iterate the cursor so rows are fetched and decoded one at a time
+        active_tasks = []
+        for row in conn.execute(SQL_LIST_ACTIVE):
+            active_tasks.append({
+                'task_id': row[0],
+                'summary': row[1],
+                'conversation': _unpack(row[2]),
+                'details': row[3],
+                'steps': _unpack(row[4]),
+                'current_step_num': row[5],
+                'is_active': row[6],
+                'is_waiting': row[7]
+            })
+        self.active_tasks.value = active_tasks
+
+@xai_component
+class TasksSetFlags(_TasksConnMixin, Component):
+    """Sets the active and/or waiting flags of a task in a single update.
+    
+    ##### inPorts:
+    - connection: SQLite database connection
+    - task_id: ID of the task to update
+    - set_active: New value for is_active, left unchanged if not set
+    - set_waiting: New value for is_waiting, left unchanged if not set
+    """
+    
+    connection: InArg[sqlite3.Connection]
+    task_id: InCompArg[str]
+    set_active: InArg[bool]
+    set_waiting: InArg[bool]
+
+    def execute(self, ctx) -> None:
+        conn = self._conn(ctx)
+        _set_flags(conn, self.task_id.value, self.set_active.value, self.set_waiting.value)
 
 @xai_component
-class TasksCompleteTask(Component):
-    """Marks a task as completed by setting is_active to false.
+class TasksCompleteTask(_TasksConnMixin, Component):
+    """Marks a task as completed by setting is_active to false and moving it to the archive.
     
     ##### inPorts:
     - connection: SQLite database connection
@@ -234,13 +488,11 @@ class TasksCompleteTask(Component):
     task_id: InCompArg[str]
 
     def execute(self, ctx) -> None:
-        conn = self.connection.value if self.connection.value is not None else ctx['tasksdb_conn']
-        cursor = conn.cursor()
-        cursor.execute('UPDATE tasks SET is_active = 0 WHERE task_id = ?', (self.task_id.value,))
-        conn.commit()
+        conn = self._conn(ctx)
+        _set_flags(conn, self.task_id.value, is_active=False)
 
 @xai_component
-class TasksDeferTask(Component):
+class TasksDeferTask(_TasksConnMixin, Component):
     """Marks a task as waiting.
     
     ##### inPorts:
@@ -252,13 +504,11 @@ class TasksDeferTask(Component):
     task_id: InCompArg[str]
 
     def execute(self, ctx) -> None:
-        conn = self.connection.value if self.connection.value is not None else ctx['tasksdb_conn']
-        cursor = conn.cursor()
-        cursor.execute('UPDATE tasks SET is_waiting = 1 WHERE task_id = ?', (self.task_id.value,))
-        conn.commit()
+        conn = self._conn(ctx)
+        _set_flags(conn, self.task_id.value, is_waiting=True)
 
 @xai_component
-class TasksResumeTask(Component):
+class TasksResumeTask(_TasksConnMixin, Component):
     """Resumes a waiting task by setting is_waiting to false.
     
     ##### inPorts:
@@ -270,14 +520,12 @@ class TasksResumeTask(Component):
     task_id: InCompArg[str]
 
     def execute(self, ctx) -> None:
-        conn = self.connection.value if self.connection.value is not None else ctx['tasksdb_conn']
-        cursor = conn.cursor()
-        cursor.execute('UPDATE tasks SET is_waiting = 0 WHERE task_id = ?', (self.task_id.value,))
-        conn.commit()
-        
+        conn = self._conn(ctx)
+        _set_flags(conn, self.task_id.value, is_waiting=False)
+
 
 @xai_component
-class TasksCloseDB(Component):
+class TasksCloseDB(_TasksConnMixin, Component):
     """Closes the SQLite database connection.
     
     ##### inPorts:
@@ -287,5 +535,5 @@ class TasksCloseDB(Component):
     connection: InArg[sqlite3.Connection]
 
     def execute(self, ctx) -> None:
-        conn = self.connection.value if self.connection.value is not None else ctx['tasksdb_conn']
+        conn = self._conn(ctx)
         conn.close()